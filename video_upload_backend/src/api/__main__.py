@@ -1,14 +1,45 @@
+import os
+import sys
+
 import uvicorn
 
+
+def _event_loop() -> str:
+    """
+    Pick the Uvicorn event loop implementation.
+
+    uvloop (libuv) is not available on Windows, so fall back to the stock asyncio loop there.
+    """
+    return "asyncio" if sys.platform == "win32" else "uvloop"
+
+
+def _worker_count() -> int:
+    """
+    Resolve the number of Uvicorn worker processes.
+
+    WEB_CONCURRENCY (or UVICORN_WORKERS) wins when set; otherwise use the 2n+1 heuristic over CPU cores.
+    Each worker runs its own event loop, so concurrent uploads do not queue behind each other.
+    """
+    configured = os.getenv("WEB_CONCURRENCY") or os.getenv("UVICORN_WORKERS")
+    if configured:
+        return max(1, int(configured))
+    return (os.cpu_count() or 1) * 2 + 1
+
+
 # PUBLIC_INTERFACE
 def run():
     """Run the FastAPI app with Uvicorn for local development."""
+    # reload must stay False: Uvicorn ignores workers > 1 when auto-reload is enabled.
     uvicorn.run(
         "api.main:app",
         host="0.0.0.0",
         port=8000,
         reload=False,
+        loop=_event_loop(),
+        http="httptools",
+        interface="asgi3",
         log_level="info",
+        workers=_worker_count(),
     )
 
 if __name__ == "__main__":
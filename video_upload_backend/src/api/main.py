@@ -1,15 +1,52 @@
+import errno
+import functools
 import os
-from pathlib import Path
-from typing import Optional
+import re
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, AsyncIterator, List, Optional
 
-from fastapi import FastAPI, File, UploadFile, HTTPException, Depends, Request, status
+import anyio
+import orjson
+from fastapi import FastAPI, Header, HTTPException, Request, Response, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel, Field
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from streaming_form_data import StreamingFormDataParser
+from streaming_form_data.parser import ParseFailedException
+from streaming_form_data.targets import BaseTarget
+
+if TYPE_CHECKING:
+    from minio import Minio
 
 # Constants
 MAX_VIDEO_SIZE_BYTES = 500 * 1024 * 1024  # 500MB
-UPLOAD_DIR = Path("./upload")  # Use relative path as per new requirements
+UPLOAD_DIR = "./upload"  # Use relative path as per new requirements
+# Received body chunks are coalesced into writes of at least this many bytes (default 8MB)
+UPLOAD_CHUNK_BYTES = int(os.getenv("UPLOAD_CHUNK_BYTES", 8 * 1024 * 1024))
+# Maximum disk flushes (fallocate/writev) running in worker threads at once, per worker process
+MAX_CONCURRENT_WRITES = int(os.getenv("MAX_CONCURRENT_WRITES", "4"))
+# Upper bound on buffers passed to a single writev() call (IOV_MAX on Linux)
+_IOV_MAX = 1024
+# Characters allowed in saved filenames; everything else is replaced with "_"
+_UNSAFE_FILENAME_CHARS = re.compile(r"[^A-Za-z0-9._-]")
+# Flags for opening upload destinations; os.open() already makes descriptors close-on-exec (PEP 446)
+_UPLOAD_OPEN_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC
+# When true, chunked request bodies without a Content-Length are rejected (411, or 417 with Expect: 100-continue)
+UPLOAD_REQUIRE_CONTENT_LENGTH = os.getenv("UPLOAD_REQUIRE_CONTENT_LENGTH", "false").lower() == "true"
+# ENV=prod disables the OpenAPI schema and Swagger UI routes
+IS_PRODUCTION = os.getenv("ENV") == "prod"
+# Comma-separated list of allowed CORS origins; set explicitly in production ("*" is for local development)
+CORS_ORIGINS = tuple(origin.strip() for origin in os.getenv("CORS_ORIGINS", "*").split(",") if origin.strip())
+# Optional S3/MinIO object storage: when UPLOAD_S3_BUCKET is set, uploads are streamed there instead of UPLOAD_DIR
+UPLOAD_S3_ENDPOINT = os.getenv("UPLOAD_S3_ENDPOINT", "")
+UPLOAD_S3_BUCKET = os.getenv("UPLOAD_S3_BUCKET", "")
+UPLOAD_S3_ACCESS_KEY = os.getenv("UPLOAD_S3_ACCESS_KEY")
+UPLOAD_S3_SECRET_KEY = os.getenv("UPLOAD_S3_SECRET_KEY")
+UPLOAD_S3_SECURE = os.getenv("UPLOAD_S3_SECURE", "true").lower() == "true"
+# S3 multipart uploads require parts of at least 5MB
+_S3_PART_SIZE = max(UPLOAD_CHUNK_BYTES, 5 * 1024 * 1024)
 
 
 def ensure_upload_dir_exists() -> None:
@@ -17,7 +54,7 @@ def ensure_upload_dir_exists() -> None:
     Ensure the upload directory exists, create with safe permissions if it doesn't.
     """
     try:
-        UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
+        os.makedirs(UPLOAD_DIR, exist_ok=True)
         # Set directory permissions to rwx for user only (best-effort, may be limited by OS)
         try:
             os.chmod(UPLOAD_DIR, 0o700)
@@ -31,6 +68,210 @@ def ensure_upload_dir_exists() -> None:
         )
 
 
+def _sanitize_filename(filename: str) -> str:
+    """
+    Reduce a client-supplied filename to a safe base name.
+
+    Directory components (either separator) are dropped, characters outside [A-Za-z0-9._-]
+    (including control bytes and NULs) become "_", and the result is capped at 255 characters.
+
+    Returns:
+        str: The sanitized filename, or "" if nothing usable remains (e.g. "..").
+    """
+    base_name = filename.replace("\\", "/").rsplit("/", 1)[-1].strip()
+    safe_filename = _UNSAFE_FILENAME_CHARS.sub("_", base_name)[-255:]
+    return safe_filename if safe_filename.strip(".") else ""
+
+
+def _write_buffers(fd: int, buffers: List[bytes]) -> None:
+    """
+    Write all buffers to a file descriptor using vectored writes.
+
+    A single writev() call flushes many received chunks without joining them into one bytes object.
+    Partial writes are handled by resuming from the first unwritten byte.
+    """
+    if not hasattr(os, "writev"):
+        # writev is POSIX-only; fall back to a single joined write elsewhere
+        view = memoryview(b"".join(buffers))
+        while view:
+            view = view[os.write(fd, view):]
+        return
+
+    views = [memoryview(buf) for buf in buffers]
+    start = 0
+    while start < len(views):
+        written = os.writev(fd, views[start:start + _IOV_MAX])
+        # Skip buffers that were fully written and trim a partially written one
+        while start < len(views) and written >= len(views[start]):
+            written -= len(views[start])
+            start += 1
+        if written:
+            views[start] = views[start][written:]
+
+
+def _preallocate(fd: int, size: int) -> None:
+    """
+    Reserve disk blocks for the declared upload size so the filesystem can allocate contiguous extents.
+
+    This is only a layout hint: failures other than running out of space are ignored. On filesystems
+    without native fallocate support glibc emulates it by writing one byte per block, which is slow
+    but still correct.
+    """
+    try:
+        os.posix_fallocate(fd, 0, size)
+    except OSError as exc:
+        if exc.errno == errno.ENOSPC:
+            raise
+
+
+@functools.lru_cache(maxsize=None)
+def _get_minio_client() -> "Minio":
+    """
+    Return the shared MinIO/S3 client, created on first use.
+
+    minio is imported here so deployments that only write to local disk never load it.
+    """
+    from minio import Minio
+
+    return Minio(
+        UPLOAD_S3_ENDPOINT,
+        access_key=UPLOAD_S3_ACCESS_KEY,
+        secret_key=UPLOAD_S3_SECRET_KEY,
+        secure=UPLOAD_S3_SECURE,
+    )
+
+
+class _StreamReader:
+    """
+    Blocking, file-like view of request body chunks for the MinIO client.
+
+    put_object() runs in a worker thread and calls read(); chunks are pulled from an anyio
+    memory stream fed by the event loop. If the sender closes the stream without marking the
+    body complete, read() raises so the MinIO client aborts the multipart upload.
+    """
+
+    def __init__(self, receive_stream) -> None:
+        self._receive_stream = receive_stream
+        self._buffer = bytearray()
+        self._eof = False
+        self.complete = False
+
+    def read(self, size: int = -1) -> bytes:
+        while not self._eof and (size < 0 or len(self._buffer) < size):
+            try:
+                self._buffer += anyio.from_thread.run(self._receive_stream.receive)
+            except anyio.EndOfStream:
+                self._eof = True
+        if self._eof and not self.complete:
+            raise IOError("Upload stream ended before the request body was fully received.")
+        if size < 0:
+            size = len(self._buffer)
+        data = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        return data
+
+
+class _ChunkTarget(BaseTarget):
+    """
+    streaming-form-data target that collects a single part's data chunks as they are parsed.
+
+    A repeated part with the same field name is flagged as a duplicate and its data is dropped.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.chunks: List[bytes] = []
+        self.started = False
+        self.finished = False
+        self.duplicate = False
+
+    def on_start(self) -> None:
+        if self.started:
+            self.duplicate = True
+        self.started = True
+
+    def on_data_received(self, chunk: bytes) -> None:
+        if not self.duplicate:
+            self.chunks.append(chunk)
+
+    def on_finish(self) -> None:
+        if not self.duplicate:
+            self.finished = True
+
+
+class _MultipartFileStream:
+    """
+    Extract the "file" field of a multipart/form-data request while the body streams in.
+
+    The body is parsed incrementally with streaming-form-data and the file's bytes are yielded
+    as soon as they are decoded, so nothing is spooled to a temporary file.
+    """
+
+    def __init__(self, request: Request) -> None:
+        self._body = request.stream()
+        self._target = _ChunkTarget()
+        try:
+            self._parser = StreamingFormDataParser(headers=request.headers)
+        except ParseFailedException as exc:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid multipart body: {exc}")
+        self._parser.register("file", self._target)
+
+    async def _feed(self) -> bool:
+        """
+        Parse the next body chunk; return False once the body is exhausted.
+        """
+        try:
+            chunk = await self._body.__anext__()
+        except StopAsyncIteration:
+            return False
+        try:
+            self._parser.data_received(chunk)
+        except ParseFailedException as exc:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid multipart body: {exc}")
+        if self._target.duplicate:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid multipart body: only one 'file' part is allowed.",
+            )
+        return True
+
+    async def read_headers(self) -> None:
+        """
+        Consume the body until the "file" part's headers have been parsed.
+
+        Raises:
+            HTTPException: If the body ends without a "file" part.
+        """
+        while not self._target.started:
+            if not await self._feed():
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Invalid multipart body: missing 'file' part.",
+                )
+
+    @property
+    def filename(self) -> Optional[str]:
+        return self._target.multipart_filename
+
+    @property
+    def content_type(self) -> Optional[str]:
+        return self._target.multipart_content_type
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        while True:
+            if self._target.chunks:
+                chunks, self._target.chunks = self._target.chunks, []
+                for chunk in chunks:
+                    yield chunk
+            if not await self._feed():
+                if not self._target.finished:
+                    raise HTTPException(
+                        status_code=status.HTTP_400_BAD_REQUEST,
+                        detail="Invalid multipart body: unexpected end of body.",
+                    )
+                return
+
+
 # Pydantic models for API documentation
 class HealthResponse(BaseModel):
     message: str = Field(..., description="Health check message")
@@ -46,11 +287,133 @@ class ErrorResponse(BaseModel):
     detail: str = Field(..., description="Error description")
 
 
+def _validate_content_length(content_length: Optional[bytes]) -> Optional[int]:
+    """
+    Validate 'Content-Length' header if provided to pre-check size.
+
+    Returns:
+        Optional[int]: Content length if present and valid.
+    Raises:
+        HTTPException: If Content-Length indicates a payload over the limit or invalid.
+    """
+    if content_length is None:
+        return None  # Cannot pre-validate; will check while receiving the body
+    try:
+        size = int(content_length)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid Content-Length header.",
+        )
+
+    if size > MAX_VIDEO_SIZE_BYTES:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"File too large. Maximum allowed size is {MAX_VIDEO_SIZE_BYTES} bytes (500MB).",
+        )
+    return size
+
+
+def _error_response(exc: HTTPException) -> ORJSONResponse:
+    """
+    Build the JSON error response for an HTTPException with consistent schema.
+    """
+    return ORJSONResponse(
+        status_code=exc.status_code,
+        content={"detail": exc.detail if isinstance(exc.detail, str) else str(exc.detail)},
+        headers=exc.headers,
+    )
+
+
+class MaxBodySizeMiddleware:
+    """
+    ASGI middleware enforcing MAX_VIDEO_SIZE_BYTES before the body reaches the application.
+
+    Requests whose Content-Length exceeds the limit are rejected as soon as headers arrive,
+    without calling the app or reading any body bytes. Bodies without a Content-Length
+    (chunked transfer) are counted as they are received and fail with 413 once over the limit,
+    or are rejected up front with 411 when UPLOAD_REQUIRE_CONTENT_LENGTH is set.
+
+    Clients sending "Expect: 100-continue" wait for the server before transmitting the body.
+    Uvicorn only sends "100 Continue" once the app first reads the body, so rejecting here
+    with 417 Expectation Failed means none of the body is transferred.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope["headers"])
+        try:
+            size = _validate_content_length(headers.get(b"content-length"))
+            if (
+                size is None
+                and UPLOAD_REQUIRE_CONTENT_LENGTH
+                and b"chunked" in headers.get(b"transfer-encoding", b"").lower()
+            ):
+                raise HTTPException(
+                    status_code=status.HTTP_411_LENGTH_REQUIRED,
+                    detail="Content-Length header is required.",
+                )
+        except HTTPException as exc:
+            if exc.status_code != status.HTTP_400_BAD_REQUEST and (
+                headers.get(b"expect", b"").lower() == b"100-continue"
+            ):
+                # Refuse the expectation so the client never sends the body
+                exc = HTTPException(status_code=status.HTTP_417_EXPECTATION_FAILED, detail=exc.detail)
+            await _error_response(exc)(scope, receive, send)
+            return
+
+        received = 0
+        response_started = False
+        max_body_size = MAX_VIDEO_SIZE_BYTES  # Local lookup in the per-message hot path
+
+        async def receive_with_limit() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > max_body_size:
+                    raise HTTPException(
+                        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                        detail=f"File too large. Maximum allowed size is {MAX_VIDEO_SIZE_BYTES} bytes (500MB).",
+                    )
+            return message
+
+        async def send_tracking_start(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, receive_with_limit, send_tracking_start)
+        except HTTPException as exc:
+            # Route handlers normally turn this into a response; this covers reads outside of them
+            if response_started:
+                raise
+            await _error_response(exc)(scope, receive, send)
+
+
+@asynccontextmanager
+async def _lifespan(_: FastAPI):
+    """
+    Prepare the upload directory once at startup instead of on every request.
+    """
+    if not UPLOAD_S3_BUCKET:
+        ensure_upload_dir_exists()
+    yield
+
+
 app = FastAPI(
     title="Video Upload Backend",
     description=(
         "A FastAPI service to upload video files up to 500 MB. "
-        "Files are saved under the ./upload directory."
+        "Files are saved under the ./upload directory or an optional S3/MinIO bucket."
     ),
     version="1.0.0",
     contact={"name": "Video Upload Service"},
@@ -59,107 +422,312 @@ app = FastAPI(
         {"name": "Health", "description": "Service health and readiness checks"},
         {"name": "Upload", "description": "Endpoints for uploading video files"},
     ],
+    openapi_url=None if IS_PRODUCTION else "/openapi.json",
+    docs_url=None if IS_PRODUCTION else "/docs",
+    redoc_url=None,
+    default_response_class=ORJSONResponse,
+    lifespan=_lifespan,
 )
 
+app.add_middleware(MaxBodySizeMiddleware)
+if not IS_PRODUCTION:
+    # The OpenAPI schema and docs are the only responses of 512+ bytes; they are disabled in production,
+    # where the middleware would compress nothing while still wrapping every upload
+    app.add_middleware(GZipMiddleware, minimum_size=512)
+# CORS is added last so it wraps every response, including early size-limit rejections
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # Adjust for production
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_origins=CORS_ORIGINS,
+    allow_methods=("GET", "HEAD", "POST"),
+    allow_headers=("content-type", "x-filename"),
+    expose_headers=("x-upload-max-bytes",),
+    max_age=86400,  # Let browsers cache preflight results for a day
 )
 
 
+# Held only around thread-offloaded disk writes, never while waiting on the client, so slow
+# uploads cannot starve other requests of slots
+_write_slots = anyio.Semaphore(MAX_CONCURRENT_WRITES, max_value=MAX_CONCURRENT_WRITES)
+
+# Health check body is constant; serialize it once. A new Response is still built per request
+# because middleware (CORS, etc.) mutates response headers in place.
+_HEALTH_BODY = orjson.dumps({"message": "Healthy"})
+
+
 # PUBLIC_INTERFACE
 @app.get(
     "/",
-    response_model=HealthResponse,
+    response_model=None,
+    responses={200: {"model": HealthResponse, "description": "Service is healthy"}},
     summary="Health Check",
     tags=["Health"],
 )
-def health_check() -> HealthResponse:
+async def health_check() -> Response:
     """
     Health check endpoint.
 
     Returns:
-        HealthResponse: A simple JSON indicating service health.
+        Response: A simple JSON indicating service health (HealthResponse schema).
     """
-    return HealthResponse(message="Healthy")
+    return Response(content=_HEALTH_BODY, media_type="application/json")
 
 
-def _validate_content_length(request: Request) -> Optional[int]:
+async def _save_to_disk(chunks: AsyncIterator[bytes], destination_path: str, expected_size: Optional[int]) -> int:
     """
-    Validate 'Content-Length' header if provided to pre-check size.
+    Stream uploaded chunks to a file under UPLOAD_DIR.
+
+    When expected_size is known the file is preallocated to it once the first UPLOAD_CHUNK_BYTES
+    batch has been received and written, and truncated to the actual size afterwards. Waiting for
+    real body bytes keeps clients that declare a large Content-Length and then stall from
+    reserving disk space they never fill.
 
     Returns:
-        Optional[int]: Content length if present and valid.
+        int: Number of bytes written.
     Raises:
-        HTTPException: If Content-Length indicates a payload over the limit or invalid.
+        HTTPException: If the body is too large or the file cannot be saved.
     """
-    content_length = request.headers.get("content-length")
-    if content_length is None:
-        return None  # Cannot pre-validate; will check during stream write
+    # Stream the upload to disk and enforce size limit.
+    # ASGI chunks are small (tens of KB), so buffer them and write in UPLOAD_CHUNK_BYTES batches.
+    total_written = 0
+    pending = []
+    pending_bytes = 0
+    # Bind loop constants and methods to locals (LOAD_FAST instead of global/attribute lookups per chunk)
+    max_size = MAX_VIDEO_SIZE_BYTES
+    flush_threshold = UPLOAD_CHUNK_BYTES
+    append_pending = pending.append
+    preallocate = bool(expected_size) and hasattr(os, "posix_fallocate")
+
     try:
-        size = int(content_length)
-    except ValueError:
+        try:
+            fd = os.open(destination_path, _UPLOAD_OPEN_FLAGS, 0o600)
+        except FileNotFoundError:
+            # Upload directory was removed after startup; recreate it and retry once
+            ensure_upload_dir_exists()
+            fd = os.open(destination_path, _UPLOAD_OPEN_FLAGS, 0o600)
+        try:
+            if hasattr(os, "posix_fadvise"):
+                # Hint the kernel that the file is written sequentially
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+            async for chunk in chunks:
+                total_written += len(chunk)
+                if total_written > max_size:
+                    raise HTTPException(
+                        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                        detail=f"File too large. Maximum allowed size is {MAX_VIDEO_SIZE_BYTES} bytes (500MB).",
+                    )
+                append_pending(chunk)
+                pending_bytes += len(chunk)
+                if pending_bytes >= flush_threshold:
+                    # Run the blocking writev() in a worker thread so the event loop keeps serving other requests.
+                    async with _write_slots:
+                        await anyio.to_thread.run_sync(_write_buffers, fd, pending)
+                        if preallocate:
+                            # The body has proven itself with a full batch; reserve the rest now
+                            preallocate = False
+                            await anyio.to_thread.run_sync(_preallocate, fd, expected_size)
+                    pending.clear()
+                    pending_bytes = 0
+            if pending:
+                async with _write_slots:
+                    await anyio.to_thread.run_sync(_write_buffers, fd, pending)
+            if expected_size and total_written < expected_size:
+                # Drop preallocated space the body did not fill
+                os.ftruncate(fd, total_written)
+            if hasattr(os, "posix_fadvise"):
+                # Kick off writeback of the dirty pages now instead of in a later flush storm. Only pages that
+                # are already clean get evicted; the rest leave the page cache once written back.
+                async with _write_slots:
+                    await anyio.to_thread.run_sync(os.posix_fadvise, fd, 0, 0, os.POSIX_FADV_DONTNEED)
+        finally:
+            os.close(fd)
+    except HTTPException:
+        # Remove partial file and re-raise explicit HTTP errors
+        try:
+            os.unlink(destination_path)
+        except OSError:
+            pass
+        raise
+    except Exception as exc:
+        # Clean up partial file on unexpected errors
+        try:
+            os.unlink(destination_path)
+        except OSError:
+            pass
         raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Invalid Content-Length header.",
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to save uploaded file: {exc}",
         )
 
-    if size > MAX_VIDEO_SIZE_BYTES:
+    return total_written
+
+
+async def _save_to_object_storage(chunks: AsyncIterator[bytes], object_name: str, content_type: str) -> int:
+    """
+    Stream uploaded chunks into UPLOAD_S3_BUCKET as a multipart upload.
+
+    Chunks are handed to put_object() running in a worker thread through a bounded memory stream,
+    so the body never touches local disk and backpressure from S3 slows down the socket reads.
+
+    Returns:
+        int: Number of bytes uploaded.
+    Raises:
+        HTTPException: If the body is too large or the object cannot be stored.
+    """
+    send_stream, receive_stream = anyio.create_memory_object_stream(max_buffer_size=64)
+    reader = _StreamReader(receive_stream)
+    total_written = 0
+    errors = []
+
+    async def _put_object() -> None:
+        try:
+            await anyio.to_thread.run_sync(
+                functools.partial(
+                    _get_minio_client().put_object,
+                    UPLOAD_S3_BUCKET,
+                    object_name,
+                    reader,
+                    length=-1,
+                    part_size=_S3_PART_SIZE,
+                    content_type=content_type,
+                )
+            )
+        except Exception as exc:
+            errors.append(exc)
+        finally:
+            receive_stream.close()
+
+    max_size = MAX_VIDEO_SIZE_BYTES  # Local lookup in the per-chunk loop
+    # Errors are collected rather than raised inside the task group, which would wrap them in an ExceptionGroup
+    async with anyio.create_task_group() as task_group:
+        task_group.start_soon(_put_object)
+        async with send_stream:
+            try:
+                async for chunk in chunks:
+                    total_written += len(chunk)
+                    if total_written > max_size:
+                        break
+                    await send_stream.send(chunk)
+                else:
+                    reader.complete = True
+            except anyio.BrokenResourceError:
+                # put_object() stopped reading; its error is reported below
+                pass
+            except Exception as exc:
+                errors.append(exc)
+
+    if total_written > max_size:
         raise HTTPException(
             status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
             detail=f"File too large. Maximum allowed size is {MAX_VIDEO_SIZE_BYTES} bytes (500MB).",
         )
-    return size
+    for exc in errors:
+        # Size-limit errors raised by MaxBodySizeMiddleware while receiving the body
+        if isinstance(exc, HTTPException):
+            raise exc
+    if errors:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to save uploaded file: {errors[0]}",
+        )
+    return total_written
+
+
+# PUBLIC_INTERFACE
+@app.head(
+    "/upload",
+    response_model=None,
+    responses={200: {"description": "Upload endpoint available; limit in X-Upload-Max-Bytes"}},
+    summary="Probe upload limits",
+    tags=["Upload"],
+)
+async def upload_limits() -> Response:
+    """
+    Let clients check the maximum upload size before sending a body.
+
+    Returns:
+        Response: Empty response with the size limit in the X-Upload-Max-Bytes header.
+    """
+    return Response(headers={"X-Upload-Max-Bytes": str(MAX_VIDEO_SIZE_BYTES)})
 
 
 # PUBLIC_INTERFACE
 @app.post(
     "/upload",
-    response_model=UploadSuccessResponse,
+    response_model=None,
     responses={
         200: {"model": UploadSuccessResponse, "description": "Upload successful"},
         400: {"model": ErrorResponse, "description": "Bad Request"},
+        411: {"model": ErrorResponse, "description": "Length Required"},
         413: {"model": ErrorResponse, "description": "Payload Too Large"},
         415: {"model": ErrorResponse, "description": "Unsupported Media Type"},
+        417: {"model": ErrorResponse, "description": "Expectation Failed (oversized Expect: 100-continue request)"},
         500: {"model": ErrorResponse, "description": "Internal Server Error"},
     },
     summary="Upload a video file",
     description=(
-        "Accepts a video file upload up to 500MB and saves it under the ./upload directory. "
-        "If the directory does not exist, it is created automatically. "
-        "The endpoint enforces the size limit using Content-Length (if provided) and by "
-        "streaming the file to disk while checking the cumulative size."
+        "Accepts a video file upload up to 500MB and saves it under the ./upload directory, "
+        "or streams it to the configured S3/MinIO bucket when UPLOAD_S3_BUCKET is set. "
+        "The video is sent either as multipart/form-data in a 'file' field, or as the raw request "
+        "body with the filename in the X-Filename header. "
+        "The directory is created at startup and recreated automatically if it goes missing. "
+        "The size limit is enforced by middleware using Content-Length (if provided), before any "
+        "body bytes are read, and by counting the cumulative size while the body streams in."
     ),
     tags=["Upload"],
+    # The body is read from the raw ASGI stream, so describe it here for the schema and Swagger UI
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "multipart/form-data": {
+                    "schema": {
+                        "type": "object",
+                        "properties": {"file": {"type": "string", "format": "binary"}},
+                        "required": ["file"],
+                    }
+                },
+                "application/octet-stream": {"schema": {"type": "string", "format": "binary"}},
+            },
+        }
+    },
 )
 async def upload_video(
     request: Request,
-    _: Optional[int] = Depends(_validate_content_length),
-    file: UploadFile = File(
-        ...,
-        description="The video file to upload. Maximum size: 500MB.",
+    filename: Optional[str] = Header(
+        None,
+        alias="X-Filename",
+        description="Name to save the uploaded video under (raw body uploads only).",
     ),
-) -> UploadSuccessResponse:
+) -> Response:
     """
-    Upload a single video file and save to ./upload.
+    Upload a single video file and save to ./upload (or UPLOAD_S3_BUCKET when configured).
+
+    The request body is consumed directly from the ASGI stream (multipart bodies are parsed
+    incrementally), so bytes are written to the destination once without being spooled to a
+    temporary file first.
 
     Parameters:
-        request (Request): The incoming request, used to inspect headers for size checks.
-        file (UploadFile): The uploaded file.
+        request (Request): The incoming request; a multipart form with a "file" field or the raw video bytes.
+        filename (Optional[str]): The client-supplied filename for raw uploads (X-Filename header).
 
     Returns:
-        UploadSuccessResponse: Information about the saved file.
+        Response: Information about the saved file (UploadSuccessResponse schema).
 
     Raises:
         HTTPException: If file is missing, too large, or cannot be saved.
     """
-    ensure_upload_dir_exists()
-
-    # Basic filename sanitization: keep base name only to prevent path traversal
-    safe_filename = os.path.basename(file.filename or "").strip()
+    content_type = request.headers.get("content-type", "")
+    if content_type.startswith("multipart/form-data"):
+        multipart = _MultipartFileStream(request)
+        await multipart.read_headers()
+        filename = multipart.filename or filename
+        content_type = multipart.content_type or "application/octet-stream"
+        chunks = multipart
+    else:
+        chunks = request.stream()
+
+    # Keep a sanitized base name only to prevent path traversal and odd characters
+    safe_filename = _sanitize_filename(filename or "")
 
     if not safe_filename:
         raise HTTPException(
@@ -167,57 +735,22 @@ async def upload_video(
             detail="Filename is required.",
         )
 
-    # Optional: rudimentary content type check - allow common video mime types but not enforce strictly
-    # Clients may set generic types; we won't block unless it's clearly not a file
-    if file.content_type is None:
-        # Some clients may not set this; proceed cautiously
-        pass
-
-    destination_path = UPLOAD_DIR / safe_filename
-
-    # Stream the file to disk in chunks and enforce size limit.
-    total_written = 0
-    chunk_size = 1024 * 1024  # 1MB chunks
-
-    try:
-        with destination_path.open("wb") as out_file:
-            while True:
-                chunk = await file.read(chunk_size)
-                if not chunk:
-                    break
-                total_written += len(chunk)
-                if total_written > MAX_VIDEO_SIZE_BYTES:
-                    # Close and remove partial file
-                    out_file.close()
-                    try:
-                        destination_path.unlink(missing_ok=True)
-                    except Exception:
-                        pass
-                    raise HTTPException(
-                        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
-                        detail=f"File too large. Maximum allowed size is {MAX_VIDEO_SIZE_BYTES} bytes (500MB).",
-                    )
-                out_file.write(chunk)
-    except HTTPException:
-        # Re-raise explicit HTTP errors
-        raise
-    except Exception as exc:
-        # Clean up partial file on unexpected errors
-        try:
-            destination_path.unlink(missing_ok=True)
-        except Exception:
-            pass
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to save uploaded file: {exc}",
+    if UPLOAD_S3_BUCKET:
+        total_written = await _save_to_object_storage(
+            chunks, safe_filename, content_type or "application/octet-stream"
         )
-    finally:
-        await file.close()
-
-    return UploadSuccessResponse(
-        filename=safe_filename,
-        size_bytes=total_written,
-        message="Upload successful",
+    else:
+        # Already validated by MaxBodySizeMiddleware; an upper bound for multipart bodies
+        content_length = request.headers.get("content-length")
+        expected_size = int(content_length) if content_length else None
+        total_written = await _save_to_disk(chunks, os.path.join(UPLOAD_DIR, safe_filename), expected_size)
+
+    # Serialize directly; the UploadSuccessResponse model only documents the schema
+    return Response(
+        content=orjson.dumps(
+            {"filename": safe_filename, "size_bytes": total_written, "message": "Upload successful"}
+        ),
+        media_type="application/json",
     )
 
 
@@ -227,7 +760,4 @@ async def http_exception_handler(_, exc: HTTPException):
     """
     Return JSON response for HTTPException with consistent schema.
     """
-    return JSONResponse(
-        status_code=exc.status_code,
-        content={"detail": exc.detail if isinstance(exc.detail, str) else str(exc.detail)},
-    )
+    return _error_response(exc)
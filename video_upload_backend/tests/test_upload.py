@@ -0,0 +1,128 @@
+import os
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.api import main
+
+LIMIT = 1024
+BOUNDARY = "testboundary"
+MULTIPART_HEADERS = {"Content-Type": f"multipart/form-data; boundary={BOUNDARY}"}
+
+
+def _part(name: str, filename: str, data: bytes) -> bytes:
+    return (
+        f"--{BOUNDARY}\r\n"
+        f'Content-Disposition: form-data; name="{name}"; filename="{filename}"\r\n'
+        "Content-Type: video/mp4\r\n\r\n"
+    ).encode() + data + b"\r\n"
+
+
+def _multipart(*parts: bytes) -> bytes:
+    return b"".join(parts) + f"--{BOUNDARY}--\r\n".encode()
+
+
+def _chunked(data: bytes, size: int = 256):
+    # A generator body makes the client send Transfer-Encoding: chunked without a Content-Length
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(main, "MAX_VIDEO_SIZE_BYTES", LIMIT)
+    with TestClient(main.app) as test_client:
+        yield test_client
+
+
+def test_raw_upload_saves_file(client):
+    response = client.post("/upload", content=b"video", headers={"X-Filename": "clip.mp4"})
+    assert response.status_code == 200
+    assert response.json()["size_bytes"] == 5
+    with open(os.path.join(main.UPLOAD_DIR, "clip.mp4"), "rb") as f:
+        assert f.read() == b"video"
+
+
+def test_multipart_upload_saves_file(client):
+    response = client.post(
+        "/upload", content=_multipart(_part("file", "clip.mp4", b"video")), headers=MULTIPART_HEADERS
+    )
+    assert response.status_code == 200
+    assert response.json()["filename"] == "clip.mp4"
+    with open(os.path.join(main.UPLOAD_DIR, "clip.mp4"), "rb") as f:
+        assert f.read() == b"video"
+
+
+def test_content_length_over_limit_is_413(client):
+    response = client.post("/upload", content=b"x" * (LIMIT + 1), headers={"X-Filename": "big.mp4"})
+    assert response.status_code == 413
+    assert os.listdir(main.UPLOAD_DIR) == []
+
+
+def test_chunked_body_over_limit_is_413_without_partial_file(client):
+    response = client.post("/upload", content=_chunked(b"x" * (LIMIT * 2)), headers={"X-Filename": "big.mp4"})
+    assert response.status_code == 413
+    assert os.listdir(main.UPLOAD_DIR) == []
+
+
+def test_expect_continue_over_limit_is_417(client):
+    response = client.post(
+        "/upload",
+        content=b"x" * (LIMIT + 1),
+        headers={"X-Filename": "big.mp4", "Expect": "100-continue"},
+    )
+    assert response.status_code == 417
+
+
+def test_chunked_body_requires_content_length_when_configured(client, monkeypatch):
+    monkeypatch.setattr(main, "UPLOAD_REQUIRE_CONTENT_LENGTH", True)
+    response = client.post("/upload", content=_chunked(b"video"), headers={"X-Filename": "clip.mp4"})
+    assert response.status_code == 411
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        pytest.param(_multipart(_part("other", "clip.mp4", b"video")), id="missing"),
+        pytest.param(
+            _multipart(_part("file", "a.mp4", b"first"), _part("file", "b.mp4", b"second")), id="duplicate"
+        ),
+        pytest.param(_part("file", "clip.mp4", b"video")[:-2], id="truncated"),
+    ],
+)
+def test_invalid_multipart_file_part_is_400(client, body):
+    response = client.post("/upload", content=body, headers=MULTIPART_HEADERS)
+    assert response.status_code == 400
+    assert os.listdir(main.UPLOAD_DIR) == []
+
+
+def test_write_buffers_resumes_after_short_writes(monkeypatch):
+    calls = []
+
+    def short_writev(fd, buffers):
+        calls.append(len(buffers))
+        data = b"".join(bytes(buf) for buf in buffers)[:3]
+        written.append(data)
+        return len(data)
+
+    written = []
+    monkeypatch.setattr(main, "_IOV_MAX", 2)
+    monkeypatch.setattr(main.os, "writev", short_writev, raising=False)
+    main._write_buffers(0, [b"hello", b"", b"world", b"!"])
+    assert b"".join(written) == b"helloworld!"
+    assert max(calls) <= 2
+
+
+@pytest.mark.parametrize(
+    "filename, expected",
+    [
+        ("../../etc/passwd", "passwd"),
+        ("..", ""),
+        ("C:\\Users\\me\\clip.mp4", "clip.mp4"),
+        ("clip\x00.mp4", "clip_.mp4"),
+        ("a" * 300 + ".mp4", "a" * 251 + ".mp4"),
+    ],
+)
+def test_sanitize_filename(filename, expected):
+    assert main._sanitize_filename(filename) == expected